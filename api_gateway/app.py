@@ -41,7 +41,7 @@ def read_root():
     return {"message": "Welcome to the DEX API Gateway"}
 
 # Initialize database and VolumeTracker
-db = Database(Settings.POSTGRES_CONFIG)
+db = Database(Settings.POSTGRES_CONFIG, Settings.PARTITION_MANAGER, Settings.PARTITION_RETENTION)
 volume_tracker = VolumeTracker(db)
 
 @app.get("/dex_volume")
@@ -19,13 +19,19 @@ class Settings:
     DEXES = os.getenv('DEXES').split(',')
     
     # Time-based partition settings
+    # 'native' for monthly range partitions, 'timescaledb' for compressed hypertables,
+    # 'pg_partman' for monthly range partitions maintained by pg_partman
+    PARTITION_MANAGER = os.getenv('PARTITION_MANAGER', 'native')
+    # pg_partman only: drop partitions older than this, e.g. '12 months'. Unset keeps all data
+    PARTITION_RETENTION = os.getenv('PARTITION_RETENTION')
+    PARTITION_MAINTENANCE_INTERVAL = int(os.getenv('PARTITION_MAINTENANCE_INTERVAL', 3600))
     PARTITION_INTERVAL = timedelta(days=90)  # 3-month partitions
     
     # Query optimization settings
     MAX_QUERY_INTERVAL = timedelta(days=30)  # Maximum time range for a single query
     DEFAULT_QUERY_LIMIT = 1000
     QUERY_INTERVAL=os.getenv('QUERY_INTERVAL')
-    MAX_CONCURRENT_QUERIES=os.getenv('MAX_CONCURRENT_QUERIES')
+    MAX_CONCURRENT_QUERIES=int(os.getenv('MAX_CONCURRENT_QUERIES', 8))
 
     # TheGraph API Key
     API_KEY = os.getenv('API_KEY')
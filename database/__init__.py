@@ -8,7 +8,7 @@ from .models import (
     CollectEvent
 )
 from .schema import PostgresSchema
-import psycopg2
+import psycopg
 
 __all__ = [
     'Database',
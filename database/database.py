@@ -1,26 +1,41 @@
 import logging
-import psycopg2
-import psycopg2.extras
-from psycopg2.extras import execute_values, RealDictCursor
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .models import Token
 from .schema import PostgresSchema
 
 logger = logging.getLogger(__name__)
 
 class Database:
-    def __init__(self, config: Dict[str, Any]):
+    # Executions after which a statement is prepared server-side on its connection
+    PREPARE_THRESHOLD = 5
+    # Connections shared by the concurrently inserting pipelines
+    POOL_MAX_SIZE = 20
+    
+    def __init__(self, config: Dict[str, Any], partition_manager: str = 'native', partition_retention: Optional[str] = None):
         """Initialize database connection"""
         self.config = config
-        self.schema = PostgresSchema()
+        self.schema = PostgresSchema(partition_manager, partition_retention)
         self.ensure_database_exists()
+        # Pooled connections keep their prepared statements from one batch to the next
+        self.pool = ConnectionPool(
+            kwargs={**config, 'prepare_threshold': self.PREPARE_THRESHOLD},
+            max_size=self.POOL_MAX_SIZE,
+            open=True
+        )
         self._init_db()
         logger.info("Database initialized")
 
     def _get_connection(self):
-        """Get a database connection"""
-        return psycopg2.connect(**self.config)
+        """Get a pooled database connection, committed and returned to the pool on exit"""
+        return self.pool.connection()
+    
+    def close(self):
+        """Close the connection pool"""
+        self.pool.close()
 
     def _init_db(self):
         """Initialize database schema"""
@@ -45,17 +60,15 @@ class Database:
         
         try:
             # Need to connect with autocommit for database creation
-            conn = psycopg2.connect(**config)
-            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
-
-            with conn.cursor() as cur:
-                # Check if database exists
-                cur.execute("SELECT 1 FROM pg_database WHERE datname = %s",
-                        (target_db,))
-                if not cur.fetchone():
-                    # Create database if it doesn't exist
-                    cur.execute(f"CREATE DATABASE {target_db}")
-                    logger.info(f"Created database {target_db}")
+            with psycopg.connect(**config, autocommit=True) as conn:
+                with conn.cursor() as cur:
+                    # Check if database exists
+                    cur.execute("SELECT 1 FROM pg_database WHERE datname = %s",
+                            (target_db,))
+                    if not cur.fetchone():
+                        # Create database if it doesn't exist
+                        cur.execute(f"CREATE DATABASE {target_db}")
+                        logger.info(f"Created database {target_db}")
         except Exception as e:
             logger.error(f"Error ensuring database exists: {str(e)}", exc_info=True)
             raise
@@ -63,202 +76,125 @@ class Database:
     def ensure_partitions(self, start_date: datetime, end_date: datetime):
         """Ensure partitions exist for the given date range"""
         try:
+            queries = self.schema.get_partition_queries(
+                start_date,
+                end_date + timedelta(days=1)  # Include end date
+            )
+            # Nothing to do when partitions are managed by the database
+            if not queries:
+                return
             with self._get_connection() as conn:
                 with conn.cursor() as cur:
-                    queries = self.schema.get_partition_queries(
-                        start_date,
-                        end_date + timedelta(days=1),  # Include end date
-                        timedelta(days=30)  # Monthly partitions
-                    )
-                    for query in queries:
-                        cur.execute(query)
-            logger.debug(f"Ensured partitions exist from {start_date} to {end_date}")
+                    # Send every partition statement in a single round trip
+                    cur.execute(";".join(queries))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Ensured partitions exist from %s to %s", start_date, end_date)
         except Exception as e:
             logger.error(f"Error ensuring partitions: {str(e)}", exc_info=True)
             raise
     
+    def run_partition_maintenance(self):
+        """Let pg_partman create upcoming partitions and drop expired ones"""
+        if self.schema.partition_manager != 'pg_partman':
+            return
+        try:
+            # run_maintenance_proc commits as it goes, so it can't run inside a transaction
+            with psycopg.connect(**self.config, autocommit=True) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("CALL partman.run_maintenance_proc()")
+            logger.info("Ran pg_partman maintenance")
+        except Exception as e:
+            logger.error(f"Error running partition maintenance: {str(e)}", exc_info=True)
+            raise
+    
     # TODO: Make an separate function for inserting events, so that it can be used for other pipelines as well
     # Make a seperate file for the DB operations
     
-    def insert_transaction_batch(self, events_list: List[List]):
+    def insert_transaction_batch(self, rows: Dict[str, List[tuple]]):
         """
-        Insert a batch of events into their respective tables
+        Insert a batch of rows into their respective tables
         
         Args:
-            events_list: List containing lists of events [swaps, mints, burns, collects, flashs]
+            rows: Insert-ready tuples keyed by table name, in the column order of PostgresSchema.INSERT_COLUMNS
         """
         try:
             # Extract timestamps from the batch
-            timestamps = [event.timestamp for events in events_list for event in events if events]
+            timestamps = []
+            for table in PostgresSchema.EVENT_TABLES:
+                timestamp_index = PostgresSchema.INSERT_COLUMNS[table].index('timestamp')
+                timestamps.extend(row[timestamp_index] for row in rows.get(table, []))
             if timestamps:
             # Determine the date range of the batch
                 start_date = datetime.utcfromtimestamp(min(timestamps))
                 end_date = datetime.utcfromtimestamp(max(timestamps))
                 self.ensure_partitions(start_date, end_date)  # Ensure partitions exist for the range
-            # Insert events
+            # Insert rows
             with self._get_connection() as conn:
                 with conn.cursor() as cur:
-                    # Insert each type of event
-                    self._batch_insert_events(cur, events_list)
+                    # Insert each table's rows
+                    self._batch_insert_rows(cur, rows)
                     
-            logger.debug(f"Successfully inserted batch of events")
+            logger.debug("Successfully inserted batch of events")
         except Exception as e:
             logger.error(f"Error inserting transaction batch: {str(e)}", exc_info=True)
             raise
 
-    def _batch_insert_events(self, cur, events_list: List[List]):
+    def _batch_insert_rows(self, cur, rows: Dict[str, List[tuple]]):
         """
-        Insert events in batch
+        Insert rows in batch, a table of rows per COPY
         
         Args:
             cur: Database cursor
-            events_list: List containing lists of events [swaps, mints, burns, collects, flashs]
+            rows: Insert-ready tuples keyed by table name
         """
-        logging.debug(f"Prepared {sum(len(events) for events in events_list)} transactions for insertion")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Prepared %d rows for insertion", sum(len(table_rows) for table_rows in rows.values()))
         try:
-            # Get the events from the list
-            swaps, mints, burns, collects, flashs = events_list
-            logging.debug("Executing batch insert with SQL: ...")
-            
-            # Helper function to collect token metadata
-            def collect_token_metadata(events):
-                metadata = set()
-                for event in events:
-                    metadata.add((event.token0_id, event.token0_symbol, event.token0_name))
-                    metadata.add((event.token1_id, event.token1_symbol, event.token1_name))
-                return metadata
-            
-            # Collect token metadata from all event types
-            token_metadata = set()
-            for event_list in [swaps, mints, burns]:
-                token_metadata.update(collect_token_metadata(event_list))
-            
-            # Insert swaps
-            if swaps:
-                swap_values = [
-                    (
-                        swap.id,
-                        psycopg2.extras.Json(swap.parent_transaction.__dict__),
-                        swap.timestamp,
-                        swap.dex_id,
-                        swap.token0_symbol,
-                        swap.token1_symbol,
-                        swap.token0_id,
-                        swap.token1_id,
-                        swap.token0_name,
-                        swap.token1_name,
-                        swap.amount0,
-                        swap.amount1,
-                        swap.amount_usd,
-                        swap.sender,
-                        swap.recipient,
-                        swap.origin,
-                        swap.fee_tier,
-                        swap.liquidity
-                        ) for swap in swaps if swap.amount0 is not None or swap.amount1 is not None
-                    ]
-                execute_values(
-                    cur,
-                    """
-                    INSERT INTO swaps (
-                        id, parent_transaction, timestamp, dex_id,
-                        token0_symbol, token1_symbol, token0_id, token1_id,
-                        token0_name, token1_name,
-                        amount0, amount1, amount_usd, sender, recipient, origin,
-                        fee_tier, liquidity
-                    ) VALUES %s
-                    ON CONFLICT (timestamp, id) DO NOTHING;
-                    """,
-                    swap_values
-                )
-            
-            # Insert mints
-            if mints:
-                mint_values = [
-                    (
-                        mint.id,
-                        psycopg2.extras.Json(mint.parent_transaction.__dict__),
-                        mint.timestamp,
-                        mint.dex_id,
-                        mint.token0_symbol,
-                        mint.token1_symbol,
-                        mint.token0_id,
-                        mint.token1_id,
-                        mint.token0_name,
-                        mint.token1_name,
-                        mint.amount0,
-                        mint.amount1,
-                        mint.amount_usd,
-                        mint.owner,
-                        mint.origin,
-                        mint.fee_tier,
-                        mint.liquidity
-                    ) for mint in mints if mint.amount0 is not None or mint.amount1 is not None
-                ]
-                execute_values(
-                    cur,
-                    """
-                    INSERT INTO mints (
-                        id, parent_transaction, timestamp, dex_id,
-                        token0_symbol, token1_symbol, token0_id, token1_id,
-                        token0_name, token1_name,
-                        amount0, amount1, amount_usd, owner, origin,
-                        fee_tier, liquidity
-                    ) VALUES %s
-                    ON CONFLICT (timestamp, id) DO NOTHING
-                    """,
-                    mint_values
-                )
-            
-            # Insert burns
-            if burns:
-                burn_values = [
-                    (
-                        burn.id,
-                        psycopg2.extras.Json(burn.parent_transaction.__dict__),
-                        burn.timestamp,
-                        burn.dex_id,
-                        burn.token0_symbol,
-                        burn.token1_symbol,
-                        burn.token0_id,
-                        burn.token1_id,
-                        burn.token0_name,
-                        burn.token1_name,
-                        burn.amount0,
-                        burn.amount1,
-                        burn.amount_usd,
-                        burn.owner,
-                        burn.origin,
-                        burn.fee_tier,
-                        burn.liquidity
-                    ) for burn in burns if burn.amount0 is not None or burn.amount1 is not None
-                ]
-                execute_values(
-                    cur,
-                    """
-                    INSERT INTO burns (
-                        id, parent_transaction, timestamp, dex_id,
-                        token0_symbol, token1_symbol, token0_id, token1_id,
-                        token0_name, token1_name,
-                        amount0, amount1, amount_usd, owner, origin,
-                        fee_tier, liquidity
-                    ) VALUES %s
-                    ON CONFLICT (timestamp, id) DO NOTHING
-                    """,
-                    burn_values
-                )
+            # Token metadata first, so events never reference unknown tokens
+            for table in ('token_metadata', *PostgresSchema.EVENT_TABLES):
+                table_rows = rows.get(table)
+                if table_rows:
+                    self._copy_rows(cur, table, table_rows)
                 
-            # Note: Collect and Flash events are currently passed as empty lists
+            # Note: Collect and Flash events are not stored yet
             # Add implementation when needed
-            
-            # Insert token metadata
-            if token_metadata:
-                self.insert_token_metadata(list(token_metadata))
 
         except Exception as e:
             logger.error(f"Error in batch insert: {str(e)}", exc_info=True)
             raise
 
+    def _copy_rows(self, cur, table: str, table_rows: List[tuple]) -> int:
+        """
+        Binary COPY rows into a session staging table, then move the new ones into the table.
+        COPY can't skip rows that already exist, the INSERT ... SELECT does.
+        
+        Args:
+            cur: Database cursor
+            table: Table the rows belong to
+            table_rows: Tuples in the column order of PostgresSchema.INSERT_COLUMNS
+        
+        Returns:
+            Number of rows that were new to the table
+        """
+        columns = ', '.join(PostgresSchema.INSERT_COLUMNS[table])
+        staging = f"{table}_staging"
+        conflict_target = "id" if table == 'token_metadata' else "timestamp, id"
+        
+        cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table}) ON COMMIT DELETE ROWS")
+        with cur.copy(f"COPY {staging} ({columns}) FROM STDIN (FORMAT BINARY)") as copy:
+            # Binary COPY applies no casts, values are sent as the column types
+            copy.set_types(PostgresSchema.INSERT_TYPES[table])
+            for row in table_rows:
+                copy.write_row(row)
+        # Concurrent batches share tokens, taking key locks in one order keeps them from deadlocking
+        cur.execute(f"""
+            INSERT INTO {table} ({columns})
+            SELECT {columns} FROM {staging}
+            ORDER BY {conflict_target}
+            ON CONFLICT ({conflict_target}) DO NOTHING
+        """)
+        return cur.rowcount
+
     def insert_token_metadata(self, tokens: List[tuple]):
         """
         Insert token metadata.
@@ -266,22 +202,14 @@ class Database:
         Args:
             tokens: List of tuples containing token metadata (id, symbol, name).
         
-        """
-        insert_query = """
-        INSERT INTO token_metadata (id, symbol, name)
-        VALUES %s
-        ON CONFLICT (id) DO NOTHING
-        RETURNING id
         """
         try:
             with self._get_connection() as conn:
                 with conn.cursor() as cur:
-                    # Execute batch insertion and fetch the count of new tokens
-                    execute_values(cur, insert_query, tokens)
-                    cur.execute("SELECT COUNT(*) FROM token_metadata WHERE id IN %s", (tuple(t[0] for t in tokens),))
-                    new_tokens = cur.fetchall()
+                    # Execute batch insertion, the INSERT reports how many tokens were new
+                    new_tokens = self._copy_rows(cur, 'token_metadata', tokens)
                     conn.commit()
-                    logger.debug(f"Inserted {new_tokens} new tokens into token_metadata.")
+                    logger.debug("Inserted %d new tokens into token_metadata.", new_tokens)
         except Exception as e:
             logger.error(f"Error inserting token metadata: {str(e)}", exc_info=True)
             raise
@@ -296,20 +224,25 @@ class Database:
         """
         Fetch events of a given type within a specified time range.
         """
+        # Token symbols and names live in token_metadata
         query = f"""
-            SELECT *
-            FROM {event_type}
-            WHERE timestamp >= %s AND timestamp <= %s
+            SELECT e.*,
+                t0.symbol AS token0_symbol, t0.name AS token0_name,
+                t1.symbol AS token1_symbol, t1.name AS token1_name
+            FROM {event_type} e
+            JOIN token_metadata t0 ON t0.id = e.token0_id
+            JOIN token_metadata t1 ON t1.id = e.token1_id
+            WHERE e.timestamp >= %s AND e.timestamp <= %s
         """
         params = [start_time, end_time]
 
         if dex_id:
-            query += " AND dex_id = %s"
+            query += " AND e.dex_id = %s"
             params.append(dex_id)
 
         try:
             with self._get_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                with conn.cursor(row_factory=dict_row) as cur:
                     cur.execute(query, params)
                     return cur.fetchall()
         except Exception as e:
@@ -323,7 +256,7 @@ class Database:
         query = "SELECT * FROM token_metadata"
         try:
             with self._get_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                with conn.cursor(row_factory=dict_row) as cur:
                     cur.execute(query)
                     tokens = cur.fetchall()
             return [dict(token) for token in tokens]
@@ -338,7 +271,7 @@ class Database:
         query = "SELECT * FROM tokens WHERE symbol = %s"
         try:
             with self._get_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                with conn.cursor(row_factory=dict_row) as cur:
                     cur.execute(query, (symbol,))
                     tokens = cur.fetchall()
             return [dict(token) for token in tokens]
@@ -352,7 +285,7 @@ class Database:
         query = "SELECT * FROM token_metadata WHERE id = %s"
         try:
             with self._get_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                with conn.cursor(row_factory=dict_row) as cur:
                     cur.execute(query, (token_id,))
                     tokens = cur.fetchall()
                     return [dict(token) for token in tokens]
@@ -396,7 +329,7 @@ class Database:
 
         try:
             with self._get_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                with conn.cursor(row_factory=dict_row) as cur:
                     cur.execute(query, params)
                     return cur.fetchall()
         except Exception as e:
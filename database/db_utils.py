@@ -1,16 +1,16 @@
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg
+from psycopg.rows import dict_row
 from contextlib import contextmanager
 
 @contextmanager
 def get_db_connection(config):
-    conn = psycopg2.connect(**config)
+    conn = psycopg.connect(**config)
     try:
         yield conn
     finally:
         conn.close()
 
 def execute_query(conn, query, params=None):
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+    with conn.cursor(row_factory=dict_row) as cur:
         cur.execute(query, params)
         return cur.fetchall()
@@ -1,24 +1,26 @@
 from dataclasses import dataclass
+from decimal import Decimal
 from typing import Optional
 
 # DEX Models #
+# Slotted so the events built by process_response stay small and quick to construct
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     id: str
     symbol: str
     name: str
 
-@dataclass
+@dataclass(slots=True)
 class BaseTransaction:
     id: str                              # Transaction ID
     dex_id: str                          # DEX ID
     block_number: int                   # Block number
     timestamp: int                      # Timestamp
-    gas_used: Optional[str] = None      # Gas used
-    gas_price: Optional[str] = None     # Gas price
+    gas_used: Optional[Decimal] = None  # Gas used
+    gas_price: Optional[Decimal] = None # Gas price
     
-@dataclass
+@dataclass(slots=True)
 class SwapEvent:
     parent_transaction: BaseTransaction # Info about the parent transaction
     
@@ -30,17 +32,17 @@ class SwapEvent:
     token1_id: str                      # Token 1 ID
     token0_name: str                    # Token 0 name
     token1_name: str                    # Token 1 name
-    amount0: str                        # Amount of token 0 in swap
-    amount1: str                        # Amount of token 1 in swap
-    amount_usd: str                     # Amount of USD of the swap (amount0 * token0_price or amount1 * token1_price)
+    amount0: Decimal                    # Amount of token 0 in swap
+    amount1: Decimal                    # Amount of token 1 in swap
+    amount_usd: Decimal                 # Amount of USD of the swap (amount0 * token0_price or amount1 * token1_price)
     sender: str                         # Address of the sender
     recipient: str                      # Address of the recipient
     dex_id: str                         # DEX ID
     origin: Optional[str] = None        # Address of the origin
     fee_tier: Optional[int] = None      # Fee tier
-    liquidity: Optional[str] = None     # Liquidity
+    liquidity: Optional[Decimal] = None  # Liquidity
     
-@dataclass
+@dataclass(slots=True)
 class MintEvent:
     parent_transaction: BaseTransaction # Info about the parent transaction
     
@@ -52,16 +54,16 @@ class MintEvent:
     token1_id: str                      # Token 1 ID
     token0_name: str                    # Token 0 name
     token1_name: str                    # Token 1 name
-    amount0: str                        # Amount of token 0 in mint
-    amount1: str                        # Amount of token 1 in mint
-    amount_usd: str                     # Amount of USD of the mint (amount0 * token0_price or amount1 * token1_price)
+    amount0: Decimal                    # Amount of token 0 in mint
+    amount1: Decimal                    # Amount of token 1 in mint
+    amount_usd: Decimal                 # Amount of USD of the mint (amount0 * token0_price or amount1 * token1_price)
     owner: str                          # Address of the owner
     dex_id: str                         # DEX ID
     origin: Optional[str] = None        # Address of the origin
     fee_tier: Optional[int] = None      # Fee tier
-    liquidity: Optional[str] = None     # Liquidity
+    liquidity: Optional[Decimal] = None  # Liquidity
 
-@dataclass
+@dataclass(slots=True)
 class BurnEvent:
     parent_transaction: BaseTransaction # Info about the parent transaction
     
@@ -73,23 +75,23 @@ class BurnEvent:
     token1_id: str                      # Token 1 ID
     token0_name: str                    # Token 0 name
     token1_name: str                    # Token 1 name
-    amount0: str                        # Amount of token 0 in burn
-    amount1: str                        # Amount of token 1 in burn
-    amount_usd: str                     # Amount of USD of the burn (amount0 * token0_price or amount1 * token1_price)
+    amount0: Decimal                    # Amount of token 0 in burn
+    amount1: Decimal                    # Amount of token 1 in burn
+    amount_usd: Decimal                 # Amount of USD of the burn (amount0 * token0_price or amount1 * token1_price)
     owner: str                          # Address of the owner
     dex_id: str                         # DEX ID
     origin: Optional[str] = None        # Address of the origin
     fee_tier: Optional[int] = None      # Fee tier
-    liquidity: Optional[str] = None     # Liquidity
+    liquidity: Optional[Decimal] = None  # Liquidity
 
 # Worry about flash and collect events later, think I may need premium
 
-@dataclass
+@dataclass(slots=True)
 class FlashEvent:
     parent_transaction: BaseTransaction # Info about the parent transaction
     pass
 
-@dataclass
+@dataclass(slots=True)
 class CollectEvent:
     parent_transaction: BaseTransaction # Info about the parent transaction
     pass
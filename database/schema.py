@@ -1,91 +1,87 @@
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Optional
+from datetime import datetime
+
+# Event table columns as (name, definition), in insert order
+COMMON_COLUMNS = [
+    ('id', 'TEXT NOT NULL'),
+    ('parent_tx_id', 'TEXT NOT NULL'),
+    ('block_number', 'BIGINT NOT NULL'),
+    ('gas_used', 'NUMERIC'),
+    ('gas_price', 'NUMERIC'),
+    ('timestamp', 'INTEGER NOT NULL'),
+    ('dex_id', 'TEXT NOT NULL'),
+    ('token0_id', 'TEXT NOT NULL REFERENCES token_metadata (id)'),
+    ('token1_id', 'TEXT NOT NULL REFERENCES token_metadata (id)'),
+    ('amount0', 'NUMERIC NOT NULL'),
+    ('amount1', 'NUMERIC NOT NULL'),
+    ('amount_usd', 'NUMERIC NOT NULL'),
+]
+
+# Address columns specific to each event table, each gets its own index
+EXTRA_COLUMNS = {
+    'swaps': [('sender', 'TEXT NOT NULL'), ('recipient', 'TEXT NOT NULL')],
+    'mints': [('owner', 'TEXT NOT NULL')],
+    'burns': [('owner', 'TEXT NOT NULL')],
+}
+
+OPTIONAL_COLUMNS = [
+    ('origin', 'TEXT'),
+    ('fee_tier', 'INTEGER'),
+    ('liquidity', 'NUMERIC'),
+]
+
+EVENT_COLUMNS = {
+    table: COMMON_COLUMNS + extra_columns + OPTIONAL_COLUMNS
+    for table, extra_columns in EXTRA_COLUMNS.items()
+}
 
 class PostgresSchema:
-    @staticmethod
-    def get_schema_queries() -> List[str]:
+    # How event tables are partitioned by timestamp
+    PARTITION_MANAGERS = ('native', 'timescaledb', 'pg_partman')
+    
+    # Chunk size and compression age for TimescaleDB hypertables, in seconds
+    CHUNK_TIME_INTERVAL = 30 * 24 * 60 * 60
+    COMPRESS_AFTER = 7 * 24 * 60 * 60
+    
+    # Monthly partitions pg_partman keeps created ahead of time
+    PARTMAN_PREMAKE = 12
+    
+    # Vacuum event tables after 5% of rows change, keeping the visibility map current for index-only scans
+    AUTOVACUUM_VACUUM_SCALE_FACTOR = 0.05
+    
+    # Tables holding DEX events
+    EVENT_TABLES = tuple(EVENT_COLUMNS)
+    
+    # Column order of the rows inserted into each table
+    INSERT_COLUMNS = {
+        **{table: tuple(name for name, _ in columns) for table, columns in EVENT_COLUMNS.items()},
+        'token_metadata': ('id', 'symbol', 'name'),
+    }
+    
+    # Postgres type of each inserted column, binary COPY needs them up front
+    INSERT_TYPES = {
+        **{table: tuple(definition.split()[0].lower() for _, definition in columns) for table, columns in EVENT_COLUMNS.items()},
+        'token_metadata': ('text', 'text', 'text'),
+    }
+    
+    def __init__(self, partition_manager: str = 'native', partition_retention: Optional[str] = None):
+        if partition_manager not in self.PARTITION_MANAGERS:
+            raise ValueError(f"Unknown partition manager: {partition_manager}")
+        self.partition_manager = partition_manager
+        # Age after which pg_partman drops partitions, e.g. '12 months', None keeps everything
+        self.partition_retention = partition_retention
+    
+    def get_schema_queries(self) -> List[str]:
         return [
             # Extensions
             "CREATE EXTENSION IF NOT EXISTS btree_gist",
+            *(["CREATE EXTENSION IF NOT EXISTS timescaledb"] if self.partition_manager == 'timescaledb' else []),
+            *([
+                "CREATE SCHEMA IF NOT EXISTS partman",
+                "CREATE EXTENSION IF NOT EXISTS pg_partman SCHEMA partman",
+            ] if self.partition_manager == 'pg_partman' else []),
             
-            # Swaps table with range partitioning
-            '''
-            CREATE TABLE IF NOT EXISTS swaps (
-                id TEXT NOT NULL,
-                parent_transaction JSONB NOT NULL,
-                timestamp INTEGER NOT NULL,
-                dex_id TEXT NOT NULL,
-                token0_symbol TEXT NOT NULL,
-                token1_symbol TEXT NOT NULL,
-                token0_id TEXT NOT NULL,
-                token1_id TEXT NOT NULL,
-                token0_name TEXT NOT NULL,
-                token1_name TEXT NOT NULL,
-                amount0 TEXT NOT NULL,
-                amount1 TEXT NOT NULL,
-                amount_usd TEXT NOT NULL,
-                sender TEXT NOT NULL,
-                recipient TEXT NOT NULL,
-                origin TEXT,
-                fee_tier INTEGER,
-                liquidity TEXT,
-                PRIMARY KEY (timestamp, id)
-            ) PARTITION BY RANGE (timestamp)
-            ''',
-            
-            # Mints table with range partitioning
-            '''
-            CREATE TABLE IF NOT EXISTS mints (
-                id TEXT NOT NULL,
-                parent_transaction JSONB NOT NULL,
-                timestamp INTEGER NOT NULL,
-                dex_id TEXT NOT NULL,
-                token0_symbol TEXT NOT NULL,
-                token1_symbol TEXT NOT NULL,
-                token0_id TEXT NOT NULL,
-                token1_id TEXT NOT NULL,
-                token0_name TEXT NOT NULL,
-                token1_name TEXT NOT NULL,
-                amount0 TEXT NOT NULL,
-                amount1 TEXT NOT NULL,
-                amount_usd TEXT NOT NULL,
-                owner TEXT NOT NULL,
-                origin TEXT,
-                fee_tier INTEGER,
-                liquidity TEXT,
-                PRIMARY KEY (timestamp, id)
-            ) PARTITION BY RANGE (timestamp)
-            ''',
-            
-            # Burns table with range partitioning
-            '''
-            CREATE TABLE IF NOT EXISTS burns (
-                id TEXT NOT NULL,
-                parent_transaction JSONB NOT NULL,
-                timestamp INTEGER NOT NULL,
-                dex_id TEXT NOT NULL,
-                token0_symbol TEXT NOT NULL,
-                token1_symbol TEXT NOT NULL,
-                token0_id TEXT NOT NULL,
-                token1_id TEXT NOT NULL,
-                token0_name TEXT NOT NULL,
-                token1_name TEXT NOT NULL,
-                amount0 TEXT NOT NULL,
-                amount1 TEXT NOT NULL,
-                amount_usd TEXT NOT NULL,
-                owner TEXT NOT NULL,
-                origin TEXT,
-                fee_tier INTEGER,
-                liquidity TEXT,
-                PRIMARY KEY (timestamp, id)
-            ) PARTITION BY RANGE (timestamp)
-            ''',
-            # Collects table
-            
-            
-            # Flashed table
-            
-            # Tokens Metadata table
+            # Tokens Metadata table, created first since events reference it
 
             '''
             CREATE TABLE IF NOT EXISTS token_metadata (
@@ -98,78 +94,314 @@ class PostgresSchema:
             '''
             ,
             
+            # Swaps, mints and burns tables with range partitioning
+            *[self._event_table_query(table) for table in self.EVENT_TABLES],
+            
+            # Collects table
+            
+            
+            # Flashed table
+            
+            
+            # Migrate amounts stored as TEXT by earlier versions to NUMERIC
+            *[self._numeric_migration_query(table) for table in self.EVENT_TABLES],
+            
+            # Migrate the parent_transaction JSONB of earlier versions to scalar columns
+            *[self._parent_transaction_migration_query(table) for table in self.EVENT_TABLES],
+            
+            # Move token symbols and names of earlier versions out of the event tables
+            *[self._token_metadata_migration_query(table) for table in self.EVENT_TABLES],
+            
+            # Turn event tables into compressed hypertables when using TimescaleDB
+            *(self._hypertable_queries() if self.partition_manager == 'timescaledb' else []),
+            
+            # Hand partition creation over to pg_partman
+            *(self._partman_queries() if self.partition_manager == 'pg_partman' else []),
+            
+            # Autovacuum settings of the tables actually holding rows
+            *self._autovacuum_queries(),
+            
             # Create optimized indexes
+            *[self._event_index_query(table) for table in self.EVENT_TABLES],
+        ]
+
+    def _event_table_query(self, table: str) -> str:
+        """Generate the CREATE TABLE query of an event table"""
+        columns = ",\n                ".join(f"{name} {definition}" for name, definition in EVENT_COLUMNS[table])
+        # Hypertables are chunked by TimescaleDB and must not be declaratively partitioned
+        partition_clause = "PARTITION BY RANGE (timestamp)" if self.partition_manager != 'timescaledb' else ""
+        return f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                {columns},
+                PRIMARY KEY (timestamp, id)
+            ) {partition_clause}
             '''
-            CREATE INDEX IF NOT EXISTS idx_swaps_tokens ON swaps (token0_symbol, token1_symbol);
-            CREATE INDEX IF NOT EXISTS idx_swaps_dex ON swaps (dex_id);
-            CREATE INDEX IF NOT EXISTS idx_swaps_parent_tx ON swaps USING GIN (parent_transaction);
-            CREATE INDEX IF NOT EXISTS idx_swaps_timestamp ON swaps (timestamp DESC);
-            CREATE INDEX IF NOT EXISTS idx_swaps_sender ON swaps (sender);
-            CREATE INDEX IF NOT EXISTS idx_swaps_recipient ON swaps (recipient);
-            
-            CREATE INDEX IF NOT EXISTS idx_mints_tokens ON mints (token0_symbol, token1_symbol);
-            CREATE INDEX IF NOT EXISTS idx_mints_dex ON mints (dex_id);
-            CREATE INDEX IF NOT EXISTS idx_mints_parent_tx ON mints USING GIN (parent_transaction);
-            CREATE INDEX IF NOT EXISTS idx_mints_timestamp ON mints (timestamp DESC);
-            CREATE INDEX IF NOT EXISTS idx_mints_owner ON mints (owner);
-            
-            CREATE INDEX IF NOT EXISTS idx_burns_tokens ON burns (token0_symbol, token1_symbol);
-            CREATE INDEX IF NOT EXISTS idx_burns_dex ON burns (dex_id);
-            CREATE INDEX IF NOT EXISTS idx_burns_parent_tx ON burns USING GIN (parent_transaction);
-            CREATE INDEX IF NOT EXISTS idx_burns_timestamp ON burns (timestamp DESC);
-            CREATE INDEX IF NOT EXISTS idx_burns_owner ON burns (owner);
+
+    @staticmethod
+    def _event_index_query(table: str) -> str:
+        """
+        Generate the index queries of an event table. Timestamps are inserted in increasing
+        order so BRIN summaries serve wide time ranges at a fraction of a B-tree's size.
+        Per-DEX time ranges use the (dex_id, timestamp) index, ordered scans the primary key.
+        Volume rollups over recent windows are index-only scans on the covering index.
+        """
+        address_indexes = "\n".join(
+            f"            CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column});"
+            for column, _ in EXTRA_COLUMNS[table]
+        )
+        return f'''
+            CREATE INDEX IF NOT EXISTS idx_{table}_tokens ON {table} (token0_id, token1_id);
+            CREATE INDEX IF NOT EXISTS idx_{table}_token1 ON {table} (token1_id);
+            DROP INDEX IF EXISTS idx_{table}_dex;
+            DROP INDEX IF EXISTS idx_{table}_timestamp;
+            CREATE INDEX IF NOT EXISTS idx_{table}_dex_ts ON {table} (dex_id, timestamp DESC);
+            CREATE INDEX IF NOT EXISTS idx_{table}_parent_tx ON {table} (parent_tx_id);
+            CREATE INDEX IF NOT EXISTS idx_{table}_timestamp_brin ON {table} USING BRIN (timestamp) WITH (pages_per_range = 32);
+            CREATE INDEX IF NOT EXISTS idx_{table}_covering ON {table} (timestamp DESC, dex_id) INCLUDE (amount_usd, token0_id, token1_id);
+{address_indexes}
             '''
-        ]
 
     @staticmethod
-    def get_partition_queries(start_date: datetime, end_date: datetime, interval: timedelta) -> List[str]:
-        """Generate partition creation queries for a date range"""
+    def _numeric_migration_query(table: str) -> str:
+        """Convert TEXT amount columns of a table to NUMERIC, only runs once"""
+        return f'''
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1
+                FROM information_schema.columns
+                WHERE table_name = '{table}'
+                AND column_name = 'amount0'
+                AND data_type = 'text'
+            ) THEN
+                ALTER TABLE {table}
+                    ALTER COLUMN amount0 TYPE NUMERIC USING amount0::NUMERIC,
+                    ALTER COLUMN amount1 TYPE NUMERIC USING amount1::NUMERIC,
+                    ALTER COLUMN amount_usd TYPE NUMERIC USING amount_usd::NUMERIC,
+                    ALTER COLUMN liquidity TYPE NUMERIC USING liquidity::NUMERIC;
+            END IF;
+        END $$;
+        '''
+
+    @staticmethod
+    def _parent_transaction_migration_query(table: str) -> str:
+        """Move the parent_transaction JSONB of a table into scalar columns, only runs once"""
+        return f'''
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1
+                FROM information_schema.columns
+                WHERE table_name = '{table}'
+                AND column_name = 'parent_transaction'
+            ) THEN
+                ALTER TABLE {table}
+                    ADD COLUMN IF NOT EXISTS parent_tx_id TEXT,
+                    ADD COLUMN IF NOT EXISTS block_number BIGINT,
+                    ADD COLUMN IF NOT EXISTS gas_used NUMERIC,
+                    ADD COLUMN IF NOT EXISTS gas_price NUMERIC;
+                UPDATE {table} SET
+                    parent_tx_id = parent_transaction->>'id',
+                    block_number = (parent_transaction->>'block_number')::BIGINT,
+                    gas_used = (parent_transaction->>'gas_used')::NUMERIC,
+                    gas_price = (parent_transaction->>'gas_price')::NUMERIC;
+                -- Dropping the column also drops its GIN and expression indexes
+                ALTER TABLE {table}
+                    ALTER COLUMN parent_tx_id SET NOT NULL,
+                    ALTER COLUMN block_number SET NOT NULL,
+                    DROP COLUMN parent_transaction;
+            END IF;
+        END $$;
+        '''
+
+    @staticmethod
+    def _token_metadata_migration_query(table: str) -> str:
+        """Replace the token symbol and name columns of a table by its token_metadata references, only runs once"""
+        return f'''
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1
+                FROM information_schema.columns
+                WHERE table_name = '{table}'
+                AND column_name = 'token0_symbol'
+            ) THEN
+                -- Keep every token of the table before its symbols and names are dropped
+                INSERT INTO token_metadata (id, symbol, name)
+                SELECT token0_id, token0_symbol, token0_name FROM {table}
+                UNION
+                SELECT token1_id, token1_symbol, token1_name FROM {table}
+                ON CONFLICT (id) DO NOTHING;
+                -- Dropping the symbol columns also drops the old idx_{table}_tokens
+                ALTER TABLE {table}
+                    DROP COLUMN token0_symbol,
+                    DROP COLUMN token1_symbol,
+                    DROP COLUMN token0_name,
+                    DROP COLUMN token1_name,
+                    ADD FOREIGN KEY (token0_id) REFERENCES token_metadata (id),
+                    ADD FOREIGN KEY (token1_id) REFERENCES token_metadata (id);
+            END IF;
+        END $$;
+        '''
+
+    def _hypertable_queries(self) -> List[str]:
+        """Generate TimescaleDB hypertable and compression queries for the event tables"""
+        queries = [
+            # Integer time columns need a "now" function for compression policies
+            '''
+            CREATE OR REPLACE FUNCTION unix_now() RETURNS INTEGER
+            LANGUAGE SQL STABLE AS $$ SELECT extract(epoch FROM now())::INTEGER $$;
+            '''
+        ]
+        for table in self.EVENT_TABLES:
+            queries.append(f'''
+            SELECT create_hypertable('{table}', 'timestamp', chunk_time_interval => {self.CHUNK_TIME_INTERVAL}, if_not_exists => TRUE);
+            SELECT set_integer_now_func('{table}', 'unix_now', replace_if_exists => TRUE);
+            
+            DO $$
+            BEGIN
+                -- Compression settings can't be changed once chunks are compressed
+                IF NOT EXISTS (
+                    SELECT 1
+                    FROM timescaledb_information.hypertables
+                    WHERE hypertable_name = '{table}'
+                    AND compression_enabled
+                ) THEN
+                    ALTER TABLE {table} SET (
+                        timescaledb.compress,
+                        timescaledb.compress_segmentby = 'dex_id',
+                        timescaledb.compress_orderby = 'timestamp DESC'
+                    );
+                END IF;
+            END $$;
+            
+            SELECT add_compression_policy('{table}', compress_after => {self.COMPRESS_AFTER}, if_not_exists => TRUE);
+            ''')
+        return queries
+
+    def _partman_queries(self) -> List[str]:
+        """Generate pg_partman registration queries for the event tables"""
         queries = []
+        for table in self.EVENT_TABLES:
+            # create_parent fails for tables it already manages
+            queries.append(f'''
+            SELECT partman.create_parent(
+                p_parent_table => 'public.{table}',
+                p_control => 'timestamp',
+                p_type => 'native',
+                p_interval => 'monthly',
+                p_epoch => 'seconds',
+                p_premake => {self.PARTMAN_PREMAKE}
+            )
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM partman.part_config
+                WHERE parent_table = 'public.{table}'
+            );
+            ''')
+            if self.partition_retention:
+                queries.append(f'''
+            UPDATE partman.part_config
+            SET retention = '{self.partition_retention}', retention_keep_table = false
+            WHERE parent_table = 'public.{table}';
+            ''')
+        return queries
+
+    def _autovacuum_queries(self) -> List[str]:
+        """Generate queries applying the autovacuum settings to the event tables"""
+        settings = f"autovacuum_vacuum_scale_factor = {self.AUTOVACUUM_VACUUM_SCALE_FACTOR}"
+        queries = []
+        for table in self.EVENT_TABLES:
+            # TimescaleDB passes hypertable storage parameters on to its chunks
+            if self.partition_manager == 'timescaledb':
+                queries.append(f"ALTER TABLE {table} SET ({settings})")
+                continue
+            
+            # Partitioned parents hold no rows and take no storage parameters, set them on the partitions
+            queries.append(f'''
+            DO $$
+            DECLARE
+                child regclass;
+            BEGIN
+                FOR child IN
+                    SELECT inhrelid::regclass FROM pg_inherits WHERE inhparent = '{table}'::regclass
+                LOOP
+                    EXECUTE format('ALTER TABLE %s SET ({settings})', child);
+                END LOOP;
+            END $$;
+            ''')
+            # pg_partman copies the template table's storage parameters to new partitions
+            if self.partition_manager == 'pg_partman':
+                queries.append(f'''
+            DO $$
+            DECLARE
+                template text;
+            BEGIN
+                SELECT template_table INTO template
+                FROM partman.part_config
+                WHERE parent_table = 'public.{table}';
+                IF template IS NOT NULL THEN
+                    EXECUTE format('ALTER TABLE %s SET ({settings})', template);
+                END IF;
+            END $$;
+            ''')
+        return queries
+
+    def get_partition_queries(self, start_date: datetime, end_date: datetime) -> List[str]:
+        """Generate a query creating the monthly partitions covering a date range"""
+        # TimescaleDB creates chunks on insert, pg_partman during maintenance
+        if self.partition_manager != 'native':
+            return []
         
-        # Round start_date down to the start of its month
-        start_date = datetime(start_date.year, start_date.month, 1)
-        
-        # Round end_date up to the end of its month
-        if end_date.month == 12:
-            end_date = datetime(end_date.year + 1, 1, 1)
-        else:
-            end_date = datetime(end_date.year, end_date.month + 1, 1)
-        
-        current_date = start_date
-        
-        while current_date < end_date:
-            # Calculate next month's start
-            if current_date.month == 12:
-                next_date = datetime(current_date.year + 1, 1, 1)
-            else:
-                next_date = datetime(current_date.year, current_date.month + 1, 1)
-            
-            partition_start = int(current_date.timestamp())
-            partition_end = int(next_date.timestamp())
-            
-            # Create partition names with YYYY_MM format
-            partition_suffix = current_date.strftime('%Y_%m')
-            
-            # Create partitions for each table
-            for table in ['swaps', 'mints', 'burns']:
-                partition_name = f"{table}_p{partition_suffix}"
-                query = f'''
-                DO $$ 
-                BEGIN 
-                    IF NOT EXISTS (
-                        SELECT 1
-                        FROM pg_class c
-                        JOIN pg_namespace n ON n.oid = c.relnamespace
-                        WHERE c.relname = '{partition_name}'
-                    ) THEN
-                        CREATE TABLE {partition_name}
-                        PARTITION OF {table}
-                        FOR VALUES FROM ({partition_start}) TO ({partition_end});
-                    END IF;
-                END $$;
-                '''
-                queries.append(query)
-            
-            current_date = next_date
-        
-        return queries
\ No newline at end of file
+        tables = ', '.join(f"'{table}'" for table in self.EVENT_TABLES)
+        settings = f"autovacuum_vacuum_scale_factor = {self.AUTOVACUUM_VACUUM_SCALE_FACTOR}"
+        # Months are walked server-side, bounds are UTC epochs to match the integer timestamp column.
+        # Earlier versions cut partitions at the host's local month boundaries, so a bound within a day
+        # of an existing partition's edge snaps to that edge instead of overlapping it or leaving a gap.
+        return [f'''
+        DO $$
+        DECLARE
+            month_start timestamp;
+            event_table text;
+            range_start bigint;
+            range_end bigint;
+        BEGIN
+            -- Concurrent batches would race to create the same partition, IF NOT EXISTS doesn't guard that
+            PERFORM pg_advisory_xact_lock(hashtext('event_partitions'));
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc('month', timestamp '{start_date:%Y-%m-%d %H:%M:%S}'),
+                    timestamp '{end_date:%Y-%m-%d %H:%M:%S}',
+                    interval '1 month'
+                )
+            LOOP
+                FOREACH event_table IN ARRAY ARRAY[{tables}] LOOP
+                    CONTINUE WHEN to_regclass(event_table || '_p' || to_char(month_start, 'YYYY_MM')) IS NOT NULL;
+                    
+                    range_start := extract(epoch FROM month_start)::bigint;
+                    range_end := extract(epoch FROM month_start + interval '1 month')::bigint;
+                    SELECT
+                        coalesce(max(bounds.upper_bound) FILTER (WHERE abs(bounds.upper_bound - range_start) < 86400), range_start),
+                        coalesce(min(bounds.lower_bound) FILTER (WHERE abs(bounds.lower_bound - range_end) < 86400), range_end)
+                    INTO range_start, range_end
+                    FROM (
+                        SELECT bound[1]::bigint AS lower_bound, bound[2]::bigint AS upper_bound
+                        FROM pg_partition_tree(event_table::regclass) tree
+                        JOIN pg_class c ON c.oid = tree.relid
+                        CROSS JOIN LATERAL regexp_match(
+                            pg_get_expr(c.relpartbound, c.oid), 'FROM \\((-?\\d+)\\) TO \\((-?\\d+)\\)'
+                        ) bound
+                        WHERE tree.isleaf
+                    ) bounds;
+                    
+                    EXECUTE format(
+                        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%s) TO (%s) WITH ({settings})',
+                        event_table || '_p' || to_char(month_start, 'YYYY_MM'),
+                        event_table,
+                        range_start,
+                        range_end
+                    );
+                END LOOP;
+            END LOOP;
+        END $$;
+        ''']
@@ -14,7 +14,8 @@ class ProcessorFactory:
     
     @classmethod
     def get_processor(cls, dex_id: str) -> BaseProcessor:
-        logger.debug(f"Attempting to get processor for DEX ID: {dex_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Attempting to get processor for DEX ID: %s", dex_id)
         processor_class = cls._processors.get(dex_id)
         if not processor_class:
             logger.error(f"No processor found for DEX: {dex_id}")
@@ -29,7 +29,8 @@ class QuerierFactory:
     
     @classmethod
     def get_querier(cls, dex_id: str) -> BaseQuerier:
-        logger.debug(f"Attempting to get querier for DEX ID: {dex_id}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Attempting to get querier for DEX ID: %s", dex_id)
         querier_info = cls._queriers.get(dex_id)
         
         if not querier_info:
@@ -38,7 +39,7 @@ class QuerierFactory:
             
         querier_class, url = querier_info
         logger.info(f"Created querier instance for DEX ID: {dex_id}")
-        return querier_class(url)
+        return querier_class(url, Settings.MAX_CONCURRENT_QUERIES)
     
         
     @classmethod
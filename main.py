@@ -6,7 +6,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 def main():
-    db = Database(Settings.POSTGRES_CONFIG)
+    db = Database(Settings.POSTGRES_CONFIG, Settings.PARTITION_MANAGER, Settings.PARTITION_RETENTION)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
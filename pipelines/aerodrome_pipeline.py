@@ -10,7 +10,7 @@ class AerodromePipeline(BasePipeline):
         super().__init__(db, querier, processor)
         logger.info(f"Initialized AerodromePipeline")
         
-    def fetch_data(self, start_timestamp, end_timestamp, skip : int) -> List[Dict[str, Any]]:
+    async def fetch_data(self, start_timestamp, end_timestamp, skip : int) -> List[Dict[str, Any]]:
         """Fetch data from Aerodrome."""
             
         # Convert datetime to UNIX timestamps if needed
@@ -19,11 +19,13 @@ class AerodromePipeline(BasePipeline):
         if isinstance(end_timestamp, datetime):
             end_timestamp = int(end_timestamp.timestamp())
             
-        logger.debug(f"Fetching Aerodrome data: {start_timestamp} to {end_timestamp}, skip={skip}")
-        return self.querier.get_transactions(start_timestamp, end_timestamp, skip=skip)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetching Aerodrome data: %s to %s, skip=%s", start_timestamp, end_timestamp, skip)
+        return await self.querier.get_transactions(start_timestamp, end_timestamp, skip=skip)
     
-    def fetch_tokens(self, skip : int) -> List[Dict[str, Any]]:
+    async def fetch_tokens(self, skip : int) -> List[Dict[str, Any]]:
         """Fetch tokens from Aerodrome."""
         
-        logger.debug(f"Fetching Aerodrome tokens, skip={skip}")
-        return self.querier.get_tokens(skip=skip)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetching Aerodrome tokens, skip=%s", skip)
+        return await self.querier.get_tokens(skip=skip)
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 from factory.querier_factory import QuerierFactory
 from factory.processor_factory import ProcessorFactory
 from database.database import Database
-import time
+import asyncio
 
 logger = logging.getLogger(__name__)
 
@@ -26,16 +26,16 @@ class BasePipeline(ABC):
         logger.info(f"Initialized {self.__class__.__name__}")
 
     @abstractmethod
-    def fetch_data(self, start_timestamp, end_timestamp, skip):
+    async def fetch_data(self, start_timestamp, end_timestamp, skip):
         """Abstract method for fetching data from the DEX."""
         pass
 
     @abstractmethod
-    def fetch_tokens(self):
+    async def fetch_tokens(self):
         """Abstract method for fetching tokens from the DEX."""
         pass
 
-    def process_batch(self, start_timestamp, end_timestamp, skip, max_retries=3, retry_delay=5):
+    async def process_batch(self, start_timestamp, end_timestamp, skip, max_retries=3, retry_delay=5):
         """
         Process a single batch of transactions.
         
@@ -53,19 +53,19 @@ class BasePipeline(ABC):
         while retry_count < max_retries:
             try:
                 # Fetch data
-                raw_data = self.fetch_data(start_timestamp, end_timestamp, skip)
+                raw_data = await self.fetch_data(start_timestamp, end_timestamp, skip)
                 transactions = raw_data.get("data", {}).get("transactions", [])
                 
                 if not transactions:
                     logger.info(f"No transactions found for skip={skip}")
                     return False, 0, 0, skip
 
-                # Process transactions
-                processed_events = self.processor.process_bulk_responses(raw_data)
-                total_events = sum(len(events) for events in processed_events)
+                # Process transactions into rows for each table
+                processed_rows = await asyncio.to_thread(self.processor.process_bulk_responses_as_tuples, raw_data)
+                total_events = sum(len(rows) for table, rows in processed_rows.items() if table != 'token_metadata')
 
-                # Store processed events in the database
-                self.db.insert_transaction_batch(processed_events)
+                # Store processed rows in the database, off the event loop so other pages keep fetching
+                await asyncio.to_thread(self.db.insert_transaction_batch, processed_rows)
 
                 # Determine if more transactions remain
                 has_more = len(transactions) >= self.batch_size
@@ -84,9 +84,9 @@ class BasePipeline(ABC):
                 if retry_count >= max_retries:
                     logger.error(f"Failed to process batch after {max_retries} attempts. Skip: {skip}, Error: {e}")
                     raise
-                time.sleep(retry_delay)
+                await asyncio.sleep(retry_delay)
 
-    def process_time_range(self, start_time, end_time):
+    async def process_time_range(self, start_time, end_time):
         """
         Process data for a specific time range.
         
@@ -100,18 +100,32 @@ class BasePipeline(ABC):
         total_transactions, total_events = 0, 0
         skip = 0
 
-        logger.debug(f"Processing data from {start_time} to {end_time}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing data from %s to %s", start_time, end_time)
 
+        # Request a window of pages at once, the querier bounds how many are in flight
+        pages = self.querier.max_concurrent_queries
         while True:
-            has_more, batch_tx, batch_events, next_skip = self.process_batch(
-                start_time, end_time, skip
-            )
-            total_transactions += batch_tx
-            total_events += batch_events
-            skip = next_skip
-
-            if not has_more:
+            tasks = [
+                asyncio.create_task(self.process_batch(start_time, end_time, skip + page * self.batch_size))
+                for page in range(pages)
+            ]
+            try:
+                batches = await asyncio.gather(*tasks)
+            except Exception:
+                # Stop the sibling pages before failing the window, so none keep inserting while it is retried
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            for batch_has_more, batch_tx, batch_events, _ in batches:
+                total_transactions += batch_tx
+                total_events += batch_events
+
+            # A short page means the range is exhausted
+            if not all(batch_has_more for batch_has_more, _, _, _ in batches):
                 break
+            skip += pages * self.batch_size
 
         logger.info(
             f"Completed processing: {total_transactions} transactions, {total_events} events"
@@ -121,7 +135,7 @@ class BasePipeline(ABC):
             "events_processed": total_events,
         }
 
-    def process_tokens(self):
+    async def process_tokens(self):
         """Process tokens from the DEX."""
         total_tokens = 0
         skip = 0
@@ -129,7 +143,7 @@ class BasePipeline(ABC):
         while True:
             try:
                 # Fetch raw token data
-                raw_data = self.fetch_tokens(skip)
+                raw_data = await self.fetch_tokens(skip)
                 tokens = self.processor._process_tokens(raw_data)  # Convert raw data to Token objects
 
                 if not tokens:
@@ -137,11 +151,12 @@ class BasePipeline(ABC):
                     break
 
                 # Insert tokens into the database
-                self.db.insert_token_metadata(tokens)
+                await asyncio.to_thread(self.db.insert_token_metadata, tokens)
 
                 total_tokens += len(tokens)
                 skip += len(tokens)
-                logger.debug(f"Processed {len(tokens)} tokens, Total processed: {total_tokens}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Processed %d tokens, Total processed: %d", len(tokens), total_tokens)
 
             except Exception as e:
                 logger.error(f"Error processing tokens after skip={skip}: {e}", exc_info=True)
@@ -13,7 +13,7 @@ class GraphPipeline(BasePipeline):
         self.dexId = dexId
         logger.info(f"Initialized GraphPipeline for {dexId}")
         
-    def fetch_data(self, start_timestamp, end_timestamp, skip : int) -> List[Dict[str, Any]]:
+    async def fetch_data(self, start_timestamp, end_timestamp, skip : int) -> List[Dict[str, Any]]:
         """Fetch data from QuickswapV3."""
             
         # Convert datetime to UNIX timestamps if needed
@@ -22,11 +22,13 @@ class GraphPipeline(BasePipeline):
         if isinstance(end_timestamp, datetime):
             end_timestamp = int(end_timestamp.timestamp())
             
-        logger.debug(f"Fetching QuickswapV3 data: {start_timestamp} to {end_timestamp}, skip={skip}")
-        return self.querier.get_transactions(start_timestamp, end_timestamp, skip=skip)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetching QuickswapV3 data: %s to %s, skip=%s", start_timestamp, end_timestamp, skip)
+        return await self.querier.get_transactions(start_timestamp, end_timestamp, skip=skip)
     
-    def fetch_tokens(self, skip : int) -> List[Dict[str, Any]]:
+    async def fetch_tokens(self, skip : int) -> List[Dict[str, Any]]:
         """Fetch tokens from Aerodrome."""
         
-        logger.debug(f"Fetching QuickswapV3 tokens, skip={skip}")
-        return self.querier.get_tokens(skip=skip)
\ No newline at end of file
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetching QuickswapV3 tokens, skip=%s", skip)
+        return await self.querier.get_tokens(skip=skip)
\ No newline at end of file
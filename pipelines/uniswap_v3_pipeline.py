@@ -10,7 +10,7 @@ class UniswapV3Pipeline(BasePipeline):
         super().__init__(db, querier, processor)
         logger.info(f"Initialized UniswapV3Pipeline")
         
-    def fetch_data(self, start_timestamp, end_timestamp, skip : int) -> List[Dict[str, Any]]:
+    async def fetch_data(self, start_timestamp, end_timestamp, skip : int) -> List[Dict[str, Any]]:
         """Fetch data from Uniswap."""
         
         # Convert datetime to UNIX timestamps if needed
@@ -19,12 +19,14 @@ class UniswapV3Pipeline(BasePipeline):
         if isinstance(end_timestamp, datetime):
             end_timestamp = int(end_timestamp.timestamp())
             
-        logger.debug(f"Fetching Uniswap data: {start_timestamp} to {end_timestamp}, skip={skip}")
-        return self.querier.get_transactions(start_timestamp, end_timestamp, skip=skip)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetching Uniswap data: %s to %s, skip=%s", start_timestamp, end_timestamp, skip)
+        return await self.querier.get_transactions(start_timestamp, end_timestamp, skip=skip)
     
-    def fetch_tokens(self, skip : int) -> List[Dict[str, Any]]:
+    async def fetch_tokens(self, skip : int) -> List[Dict[str, Any]]:
         """Fetch tokens from Uniswap."""
         
-        logger.debug(f"Fetching Uniswap tokens, skip={skip}")
-        return self.querier.get_tokens(skip=skip)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetching Uniswap tokens, skip=%s", skip)
+        return await self.querier.get_tokens(skip=skip)
         
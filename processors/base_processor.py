@@ -1,23 +1,97 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
-from database.models import BaseTransaction
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+from database.models import BaseTransaction, SwapEvent, MintEvent, BurnEvent
 
 logger = logging.getLogger(__name__)
 
+def to_decimal(value: Optional[str]) -> Optional[Decimal]:
+    """Convert a subgraph BigInt/BigDecimal string to a Decimal, keeping None"""
+    return Decimal(value) if value is not None else None
+
 class BaseProcessor(ABC):
+    # Keys of the event lists returned by process_response and process_bulk_responses
+    EVENT_KINDS = ('swaps', 'mints', 'burns', 'collects', 'flashs')
+    # Event kinds that are stored, their _process_* build insert rows and the token rows they reference
+    ROW_KINDS = ('swaps', 'mints', 'burns')
+    # Event objects built from those rows by process_response
+    EVENT_CLASSES = {'swaps': SwapEvent, 'mints': MintEvent, 'burns': BurnEvent}
+    # Subgraph transaction field holding each event kind, overridden where a subgraph differs
+    EVENT_SOURCES = {'swaps': 'swaps', 'mints': 'mints', 'burns': 'burns', 'collects': 'collects', 'flashs': 'flashed'}
+
     def __init__(self, dex_id: str):
         self.dex_id = dex_id
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-        self.logger.debug(f"Initialized {self.__class__.__name__} for {dex_id}")
+        # Pair each event kind with its source field and processor once, not per transaction
+        self._event_processors = tuple(
+            (kind, self.EVENT_SOURCES[kind], getattr(self, f'_process_{kind}'))
+            for kind in self.EVENT_KINDS
+        )
+        self._row_processors = tuple(entry for entry in self._event_processors if entry[0] in self.ROW_KINDS)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Initialized %s for %s", self.__class__.__name__, dex_id)
     
     @abstractmethod
-    def process_response(self, response_data: Dict[str, Any]) -> tuple[BaseTransaction, Dict[str, list]]:
-        """Process the API response and return transaction and events"""
+    def process_response(self, response_data: Dict[str, Any]) -> Dict[str, list]:
+        """Process the API response and return its events keyed by EVENT_KINDS"""
         pass
     
     @abstractmethod
-    def process_bulk_responses(self, bulk_response: Dict[str, Any]) -> List[Dict]:
-        """Process the API response and return transaction and events"""
+    def _process_transaction(self, transaction_data: Dict[str, Any]) -> BaseTransaction:
+        """Build the base transaction shared by a transaction's events"""
         pass
     
+    def _process_events(self, transaction_data: Dict[str, Any], transaction: BaseTransaction) -> Dict[str, list]:
+        """Process the events of a transaction, skipping kinds it has none of"""
+        events = {}
+        for kind, source, process in self._event_processors:
+            data = transaction_data.get(source)
+            if not data:
+                events[kind] = []
+            elif kind in self.ROW_KINDS:
+                events[kind] = self._rows_to_events(kind, *process(data, transaction), transaction)
+            else:
+                events[kind] = process(data, transaction)
+        return events
+    
+    def _rows_to_events(self, kind: str, rows: List[tuple], token_rows: List[tuple], transaction: BaseTransaction) -> list:
+        """Build the event objects of a kind from its insert rows, for callers that want objects over tuples"""
+        event_class = self.EVENT_CLASSES[kind]
+        tokens = {token_id: (symbol, name) for token_id, symbol, name in token_rows}
+        events = []
+        for (event_id, _, _, _, _, timestamp, dex_id, token0_id, token1_id,
+             amount0, amount1, amount_usd, *addresses, origin, fee_tier, liquidity) in rows:
+            token0_symbol, token0_name = tokens[token0_id]
+            token1_symbol, token1_name = tokens[token1_id]
+            events.append(event_class(
+                transaction, timestamp, event_id, token0_symbol, token1_symbol, token0_id, token1_id,
+                token0_name, token1_name, amount0, amount1, amount_usd, *addresses, dex_id, origin, fee_tier, liquidity
+            ))
+        return events
+    
+    @abstractmethod
+    def process_bulk_responses(self, bulk_response: Dict[str, Any]) -> Dict[str, list]:
+        """Process the API response and return events keyed by EVENT_KINDS"""
+        pass
+
+    def process_bulk_responses_as_tuples(self, response_data: Dict[str, Any]) -> Dict[str, List[tuple]]:
+        """Process the API response into insert-ready rows keyed by table name, without building event objects"""
+        txs = (response_data.get('data') or {}).get('transactions') or []
+        rows = {table: [] for table in self.ROW_KINDS}
+        token_rows = set()
+        try:
+            for transaction_data in txs:
+                transaction = self._process_transaction(transaction_data)
+                for kind, source, process in self._row_processors:
+                    data = transaction_data.get(source)
+                    if data:
+                        kind_rows, kind_token_rows = process(data, transaction)
+                        rows[kind] += kind_rows
+                        token_rows.update(kind_token_rows)
+        except Exception as e:
+            self.logger.error(f"Error processing bulk responses on {self.dex_id}: {e}", exc_info=True)
+            raise
+        rows['token_metadata'] = list(token_rows)
+        
+        return rows
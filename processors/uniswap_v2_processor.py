@@ -1,10 +1,14 @@
+from operator import itemgetter
 from typing import Dict, Any, List, Tuple
-from .base_processor import BaseProcessor
-from database.models import BaseTransaction, SwapEvent, MintEvent, CollectEvent, BurnEvent, FlashEvent
+from .base_processor import BaseProcessor, to_decimal
+from database.models import BaseTransaction, CollectEvent, FlashEvent
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Built once, itemgetter pulls several keys in a single C call
+_token_fields = itemgetter('symbol', 'name', 'id')
+
 class UniswapV2Processor(BaseProcessor):
     def __init__(self):
         super().__init__('uniswap_v2')
@@ -13,140 +17,178 @@ class UniswapV2Processor(BaseProcessor):
     def process_response(self, transaction_data: Dict[str, Any]) -> Dict:
         
         # Create base transaction
-        transaction = BaseTransaction(
-            id=transaction_data['id'],
-            dex_id=self.dex_id,
-            block_number=int(transaction_data['blockNumber']),
-            timestamp=int(transaction_data['timestamp']),
-        )
+        transaction = self._process_transaction(transaction_data)
         
-        #self.logger.debug(f"Processing transaction {transaction.id} from block {transaction.block_number}")
-                
         # Process events
-        events = {
-            'swaps': self._process_swaps(transaction_data.get('swaps', []), transaction),
-            'mints': self._process_mints(transaction_data.get('mints', []), transaction),
-            'burns': self._process_burns(transaction_data.get('burns', []), transaction),
-            'collects': self._process_collects(transaction_data.get('collects', []), transaction),
-            'flashs': self._process_flashs(transaction_data.get('flashed', []), transaction),
-        }
-        #self.logger.debug(f"Processed events for transaction {transaction.id}: "
-        #                    f"swaps={len(events['swaps'])}, mints={len(events['mints'])}, "
-        #                    f"burns={len(events['burns'])}, collects={len(events['collects'])}, "
-        #                    f"flashs={len(events['flashs'])}")
+        events = self._process_events(transaction_data, transaction)
         
         return events
     
-    def process_bulk_responses(self, bulk_response: Dict[str, Any]) -> List[Dict]:
-        self.logger.debug(f"Processing bulk response on {self.dex_id} with {len(bulk_response.get('data', {}).get('transactions', []))} transactions")
-        results = [[],[],[],[],[]]
+    def process_bulk_responses(self, bulk_response: Dict[str, Any]) -> Dict[str, list]:
+        txs = (bulk_response.get('data') or {}).get('transactions') or []
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Processing bulk responses on %s with %d transactions", self.dex_id, len(txs))
+        keys = self.EVENT_KINDS
+        results = {key: [] for key in keys}
         try:
             # Iterate through each transaction in response
-            for transaction in bulk_response['data']['transactions']:
+            for transaction in txs:
                 events = self.process_response(transaction)
                 
                 # Append events to results
-                results[0].extend(events['swaps'])
-                results[1].extend(events['mints'])
-                results[2].extend(events['burns'])
-                results[3].extend(events['collects'])
-                results[4].extend(events['flashs'])
+                for key in keys:
+                    results[key].extend(events[key])
             
-            self.logger.debug(f"Processed {len(results[0])} swaps, {len(results[1])} mints, {len(results[2])} burns, {len(results[3])} collects, {len(results[4])} flashs for a total of {len(results[0]) + len(results[1]) + len(results[2]) + len(results[3]) + len(results[4])} events.")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "Processed %d swaps, %d mints, %d burns, %d collects, %d flashs for a total of %d events.",
+                    *map(len, results.values()), sum(map(len, results.values()))
+                )
         except Exception as e:
             self.logger.error(f"Error processing bulk response on {self.dex_id}: {e}", exc_info=True)
         return results
     
-    def _process_swaps(self, swaps: List[Dict], transaction: BaseTransaction) -> List[SwapEvent]:
+    def _process_transaction(self, transaction_data: Dict[str, Any]) -> BaseTransaction:
+        return BaseTransaction(
+            id=transaction_data['id'],
+            dex_id=self.dex_id,
+            block_number=int(transaction_data['blockNumber']),
+            timestamp=int(transaction_data['timestamp']),
+        )
+    
+    def _process_swaps(self, swaps: List[Dict], transaction: BaseTransaction) -> Tuple[List[tuple], List[tuple]]:
         try:
-            swap_transactions = []
+            swap_rows = []
+            token_rows = []
+            dex_id = self.dex_id
+            transaction_id, block_number = transaction.id, transaction.block_number
+            gas_used, gas_price = transaction.gas_used, transaction.gas_price
             for swap in swaps:
-                swap_transaction = SwapEvent(
-                    parent_transaction=transaction,
-                    timestamp=int(swap['timestamp']),
-                    id=swap['id'],
-                    token0_symbol=swap['pair']['token0']['symbol'],
-                    token1_symbol=swap['pair']['token1']['symbol'],
-                    token0_id=swap['pair']['token0']['id'],
-                    token1_id=swap['pair']['token1']['id'],
-                    token0_name=swap['pair']['token0']['name'],
-                    token1_name=swap['pair']['token1']['name'],
-                    amount0=swap['amount0In'] if float(swap['amount0In']) > 0 else float(swap['amount0Out']),
-                    amount1=swap['amount1In'] if float(swap['amount1In']) > 0 else float(swap['amount1Out']),
-                    amount_usd=swap['amountUSD'],
-                    sender=swap['sender'],
-                    recipient=swap['to'],
-                    dex_id=self.dex_id,
+                pair = swap['pair']
+                token0_symbol, token0_name, token0_id = _token_fields(pair['token0'])
+                token1_symbol, token1_name, token1_id = _token_fields(pair['token1'])
+                # Each token either goes in or out of the pair, use whichever side is set
+                amount0_in = to_decimal(swap['amount0In'])
+                amount1_in = to_decimal(swap['amount1In'])
+                amount0 = amount0_in if amount0_in > 0 else to_decimal(swap['amount0Out'])
+                amount1 = amount1_in if amount1_in > 0 else to_decimal(swap['amount1Out'])
+                token_rows.append((token0_id, token0_symbol, token0_name))
+                token_rows.append((token1_id, token1_symbol, token1_name))
+                swap_row = (
+                    swap['id'],
+                    transaction_id,
+                    block_number,
+                    gas_used,
+                    gas_price,
+                    int(swap['timestamp']),
+                    dex_id,
+                    token0_id,
+                    token1_id,
+                    amount0,
+                    amount1,
+                    to_decimal(swap['amountUSD']),
+                    swap['sender'],
+                    swap['to'],
+                    None,  # No origin, fee tiers or liquidity on Uniswap V2 swaps
+                    None,
+                    None
                 )
-                swap_transactions.append(swap_transaction)
-                #self.logger.debug(f"Processed swap event {swap['id']} for transaction {transaction.id}")
-            #self.logger.debug(f"Processed {len(swap_transactions)} swap events for transaction {transaction.id}")
+                swap_rows.append(swap_row)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Processed %d swap events for transaction %s", len(swap_rows), transaction.id)
         except Exception as e:
             self.logger.error(f"Error processing swaps on {self.dex_id}: {e}", exc_info=True)
             raise e
         
-        return swap_transactions
+        return swap_rows, token_rows
     
-    def _process_mints(self, mints: List[Dict], transaction: BaseTransaction) -> List[MintEvent]:
+    def _process_mints(self, mints: List[Dict], transaction: BaseTransaction) -> Tuple[List[tuple], List[tuple]]:
         try:
-            mint_transactions = []
+            mint_rows = []
+            token_rows = []
+            dex_id = self.dex_id
+            transaction_id, block_number = transaction.id, transaction.block_number
+            gas_used, gas_price = transaction.gas_used, transaction.gas_price
             for mint in mints:
-                mint_transaction = MintEvent(
-                    parent_transaction=transaction,
-                    timestamp=int(mint['timestamp']),
-                    id=mint['id'],
-                    token0_symbol=mint['pair']['token0']['symbol'],
-                    token1_symbol=mint['pair']['token1']['symbol'],
-                    token0_id=mint['pair']['token0']['id'],
-                    token1_id=mint['pair']['token1']['id'],
-                    token0_name=mint['pair']['token0']['name'],
-                    token1_name=mint['pair']['token1']['name'],
-                    amount0=mint['amount0'],
-                    amount1=mint['amount1'],
-                    amount_usd=mint['amountUSD'],
-                    owner=mint['to'],
-                    dex_id=self.dex_id,
-                    liquidity=mint['liquidity'],
-                    origin=mint['sender'],
+                pair = mint['pair']
+                token0_symbol, token0_name, token0_id = _token_fields(pair['token0'])
+                token1_symbol, token1_name, token1_id = _token_fields(pair['token1'])
+                amount0 = to_decimal(mint['amount0'])
+                amount1 = to_decimal(mint['amount1'])
+                # Skip events without any amounts
+                if amount0 is None and amount1 is None:
+                    continue
+                token_rows.append((token0_id, token0_symbol, token0_name))
+                token_rows.append((token1_id, token1_symbol, token1_name))
+                mint_row = (
+                    mint['id'],
+                    transaction_id,
+                    block_number,
+                    gas_used,
+                    gas_price,
+                    int(mint['timestamp']),
+                    dex_id,
+                    token0_id,
+                    token1_id,
+                    amount0,
+                    amount1,
+                    to_decimal(mint['amountUSD']),
+                    mint['to'],
+                    mint['sender'],
+                    None,  # No fee tiers on Uniswap V2
+                    to_decimal(mint['liquidity'])
                 )
-                
-                mint_transactions.append(mint_transaction)
-                #self.logger.debug(f"Processed mint event {mint['id']} for transaction {transaction.id}")
-            #self.logger.debug(f"Processed {len(mint_transactions)} mint events for transaction {transaction.id}")
+                mint_rows.append(mint_row)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Processed %d mint events for transaction %s", len(mint_rows), transaction.id)
         except Exception as e:
             self.logger.error(f"Error processing mints on {self.dex_id}: {e}", exc_info=True)
             raise e
-        return mint_transactions
+        return mint_rows, token_rows
     
-    def _process_burns(self, burns: List[Dict], transaction: BaseTransaction) -> List[BurnEvent]:
+    def _process_burns(self, burns: List[Dict], transaction: BaseTransaction) -> Tuple[List[tuple], List[tuple]]:
         try:
-            burn_transactions = []
+            burn_rows = []
+            token_rows = []
+            dex_id = self.dex_id
+            transaction_id, block_number = transaction.id, transaction.block_number
+            gas_used, gas_price = transaction.gas_used, transaction.gas_price
             for burn in burns:
-                burn_transaction = BurnEvent(
-                    parent_transaction=transaction,
-                    timestamp=int(burn['timestamp']),
-                    id=burn['id'],
-                    token0_symbol=burn['pair']['token0']['symbol'],
-                    token1_symbol=burn['pair']['token1']['symbol'],
-                    token0_id=burn['pair']['token0']['id'],
-                    token1_id=burn['pair']['token1']['id'],
-                    token0_name=burn['pair']['token0']['name'],
-                    token1_name=burn['pair']['token1']['name'],
-                    amount0=burn['amount0'],
-                    amount1=burn['amount1'],
-                    amount_usd=burn['amountUSD'],
-                    owner=burn['to'],
-                    dex_id=self.dex_id,
-                    liquidity=burn['liquidity'],
-                    origin=burn['sender'],
+                pair = burn['pair']
+                token0_symbol, token0_name, token0_id = _token_fields(pair['token0'])
+                token1_symbol, token1_name, token1_id = _token_fields(pair['token1'])
+                amount0 = to_decimal(burn['amount0'])
+                amount1 = to_decimal(burn['amount1'])
+                # Skip events without any amounts
+                if amount0 is None and amount1 is None:
+                    continue
+                token_rows.append((token0_id, token0_symbol, token0_name))
+                token_rows.append((token1_id, token1_symbol, token1_name))
+                burn_row = (
+                    burn['id'],
+                    transaction_id,
+                    block_number,
+                    gas_used,
+                    gas_price,
+                    int(burn['timestamp']),
+                    dex_id,
+                    token0_id,
+                    token1_id,
+                    amount0,
+                    amount1,
+                    to_decimal(burn['amountUSD']),
+                    burn['to'],
+                    burn['sender'],
+                    None,  # No fee tiers on Uniswap V2
+                    to_decimal(burn['liquidity'])
                 )
-                burn_transactions.append(burn_transaction)
-                #self.logger.debug(f"Processed burn event {burn['id']} for transaction {transaction.id}")
-            #self.logger.debug(f"Processed {len(burn_transactions)} burn events for transaction {transaction.id}")
+                burn_rows.append(burn_row)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Processed %d burn events for transaction %s", len(burn_rows), transaction.id)
         except Exception as e:
             self.logger.error(f"Error processing burns on {self.dex_id}: {e}", exc_info=True)
             raise e
-        return burn_transactions
+        return burn_rows, token_rows
     
 
     ## Don't exist in Uniswap V2 ##
@@ -166,7 +208,7 @@ class UniswapV2Processor(BaseProcessor):
                 )
                 for token in tokens_data.get("data", {}).get("tokens", [])
             ]  
-            self.logger.debug(f"Processed {len(tokens)} tokens")
+            self.logger.debug("Processed %d tokens", len(tokens))
         except Exception as e:
             self.logger.error(f"Error processing tokens: {str(e)}", exc_info=True)
             raise e
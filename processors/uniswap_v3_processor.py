@@ -1,33 +1,42 @@
+from operator import itemgetter
 from typing import Dict, Any, List, Tuple
-from .base_processor import BaseProcessor
-from database.models import BaseTransaction, SwapEvent, MintEvent, CollectEvent, BurnEvent, FlashEvent, Token
+from .base_processor import BaseProcessor, to_decimal
+from database.models import BaseTransaction, CollectEvent, FlashEvent, Token
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Built once, itemgetter pulls several keys in a single C call
+_token_fields = itemgetter('symbol', 'name', 'id')
+_pool_fields = itemgetter('feeTier', 'liquidity')
+
 
 class UniswapV3Processor(BaseProcessor):
     def __init__(self):
         super().__init__('uniswap_v3')
         self.logger.info("Initialized UniswapV3Processor...")
     
-    def process_bulk_responses(self, response_data: Dict[str, Any]) -> List[Dict[str, list]]:
-        self.logger.debug(f"Processing bulk responses on {self.dex_id} with {len(response_data.get('data', {}).get('transactions', []))} transactions")
+    def process_bulk_responses(self, response_data: Dict[str, Any]) -> Dict[str, list]:
+        txs = (response_data.get('data') or {}).get('transactions') or []
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Processing bulk responses on %s with %d transactions", self.dex_id, len(txs))
         # Initialize results for each event type
-        results = [[],[],[],[],[]]
+        keys = self.EVENT_KINDS
+        results = {key: [] for key in keys}
         try:
             # Iterate through each transaction in the response
-            for transaction_data in response_data['data']['transactions']:
+            for transaction_data in txs:
                 events = self.process_response(transaction_data)
                 
                 # Append events to results
-                results[0].extend(events['swaps']) # Add swaps to results
-                results[1].extend(events['mints']) # Add mints to results
-                results[2].extend(events['burns']) # Add burns to results
-                results[3].extend(events['collects']) # Add collects to results
-                results[4].extend(events['flashs']) # Add flashs to results
+                for key in keys:
+                    results[key].extend(events[key])
                 
-            self.logger.debug(f"Processed {len(results[0])} swaps, {len(results[1])} mints, {len(results[2])} collects, {len(results[3])} burns, {len(results[4])} flashs for a total of {len(results[0]) + len(results[1]) + len(results[2]) + len(results[3]) + len(results[4])} events.")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "Processed %d swaps, %d mints, %d burns, %d collects, %d flashs for a total of %d events.",
+                    *map(len, results.values()), sum(map(len, results.values()))
+                )
         except Exception as e:
             self.logger.error(f"Error processing bulk responseson : {str(e)}", exc_info=True)
             raise e
@@ -37,157 +46,170 @@ class UniswapV3Processor(BaseProcessor):
     def process_response(self, transaction_data: Dict[str, Any]) -> Dict:
         
         # Create base transaction
-        transaction = BaseTransaction(
+        transaction = self._process_transaction(transaction_data)
+        
+        # Process events
+        events = self._process_events(transaction_data, transaction)
+        
+        return events
+    
+    def _process_transaction(self, transaction_data: Dict[str, Any]) -> BaseTransaction:
+        return BaseTransaction(
             id=transaction_data['id'],
             dex_id=self.dex_id,
             block_number=int(transaction_data['blockNumber']),
             timestamp=int(transaction_data['timestamp']),
-            gas_used=transaction_data['gasUsed'],
-            gas_price=transaction_data['gasPrice']
+            gas_used=to_decimal(transaction_data['gasUsed']),
+            gas_price=to_decimal(transaction_data['gasPrice'])
         )
-        
-        #self.logger.debug(f"Processing transaction {transaction.id} from block {transaction.block_number}")
-        
-        # Process events
-        events = {
-            'swaps': self._process_swaps(transaction_data.get('swaps', []), transaction),
-            'mints': self._process_mints(transaction_data.get('mints', []), transaction),
-            'burns': self._process_burns(transaction_data.get('burns', []), transaction),
-            'collects': self._process_collects(transaction_data.get('collects', []), transaction),
-            'flashs': self._process_flashs(transaction_data.get('flashed', []), transaction)
-        }
-        #self.logger.debug(f"Processed events for transaction {transaction.id}: "
-        #                    f"swaps={len(events['swaps'])}, mints={len(events['mints'])}, "
-        #                    f"burns={len(events['burns'])}, collects={len(events['collects'])}, "
-        #                    f"flashs={len(events['flashs'])}")
-        
-        return events
     
-    def _process_swaps(self, swaps_data: List[Dict], transaction: BaseTransaction) -> List[SwapEvent]:
-        
-        # Check if there are any swap transactions, check for none
-        if not len(swaps_data) > 0:
-            #self.logger.debug(f"No swap events found for transaction {transaction.id}")
-            return []
+    def _process_swaps(self, swaps_data: List[Dict], transaction: BaseTransaction) -> Tuple[List[tuple], List[tuple]]:
         try:
             # Get info from the swap transaction
-            swap_transactions = []
+            swap_rows = []
+            token_rows = []
+            timestamp = transaction.timestamp
+            dex_id = self.dex_id
+            transaction_id, block_number = transaction.id, transaction.block_number
+            gas_used, gas_price = transaction.gas_used, transaction.gas_price
             for swap in swaps_data:
-                swap_transaction = SwapEvent(
-                    parent_transaction = transaction,
-                    timestamp = transaction.timestamp,
-                    id = swap['id'],
-                    token0_symbol = swap['pool']['token0']['symbol'],
-                    token1_symbol = swap['pool']['token1']['symbol'],
-                    token0_name = swap['pool']['token0']['name'],
-                    token1_name = swap['pool']['token1']['name'],
-                    token0_id = swap['pool']['token0']['id'],
-                    token1_id = swap['pool']['token1']['id'],
-                    amount0 = swap['amount0'],
-                    amount1 = swap['amount1'],
-                    amount_usd = swap['amountUSD'],
-                    sender = swap['sender'],
-                    recipient = swap['recipient'],
-                    origin = swap['origin'],
-                    fee_tier = swap['pool']['feeTier'],
-                    liquidity = swap['pool']['liquidity'],
-                    dex_id = self.dex_id
+                pool = swap['pool']
+                token0_symbol, token0_name, token0_id = _token_fields(pool['token0'])
+                token1_symbol, token1_name, token1_id = _token_fields(pool['token1'])
+                fee_tier, liquidity = _pool_fields(pool)
+                amount0 = to_decimal(swap['amount0'])
+                amount1 = to_decimal(swap['amount1'])
+                # Skip events without any amounts
+                if amount0 is None and amount1 is None:
+                    continue
+                token_rows.append((token0_id, token0_symbol, token0_name))
+                token_rows.append((token1_id, token1_symbol, token1_name))
+                swap_row = (
+                    swap['id'],
+                    transaction_id,
+                    block_number,
+                    gas_used,
+                    gas_price,
+                    timestamp,
+                    dex_id,
+                    token0_id,
+                    token1_id,
+                    amount0,
+                    amount1,
+                    to_decimal(swap['amountUSD']),
+                    swap['sender'],
+                    swap['recipient'],
+                    swap['origin'],
+                    int(fee_tier) if fee_tier is not None else None,
+                    to_decimal(liquidity)
                 )
-                swap_transactions.append(swap_transaction)
-                #self.logger.debug(f"Processed swap event {swap['id']} for transaction {transaction.id}")
+                swap_rows.append(swap_row)
                 
-            #self.logger.debug(f"Processed {len(swap_transactions)} swap events for transaction {transaction.id}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Processed %d swap events for transaction %s", len(swap_rows), transaction.id)
         except Exception as e:
             self.logger.error(f"Error processing swap events for transaction {transaction.id}: {str(e)}", exc_info=True)
             raise e
         
-        return swap_transactions
+        return swap_rows, token_rows
     
-    def _process_mints(self, mints_data: List[Dict], transaction: BaseTransaction) -> List[MintEvent]:
-        
-        # Check if there are any mint transactions, check for none
-        if not len(mints_data) > 0:
-            #self.logger.debug(f"No mint events found for transaction {transaction.id}")
-            return []
-        
+    def _process_mints(self, mints_data: List[Dict], transaction: BaseTransaction) -> Tuple[List[tuple], List[tuple]]:
         try:
-            mint_transactions = []
+            mint_rows = []
+            token_rows = []
+            timestamp = transaction.timestamp
+            dex_id = self.dex_id
+            transaction_id, block_number = transaction.id, transaction.block_number
+            gas_used, gas_price = transaction.gas_used, transaction.gas_price
             for mint in mints_data:
-                mint_transaction = MintEvent(
-                    parent_transaction = transaction,
-                    timestamp = transaction.timestamp,
-                    id = mint['id'],
-                    token0_symbol = mint['pool']['token0']['symbol'],
-                    token1_symbol = mint['pool']['token1']['symbol'],
-                    token0_name = mint['pool']['token0']['name'],
-                    token1_name = mint['pool']['token1']['name'],
-                    token0_id = mint['pool']['token0']['id'],
-                    token1_id = mint['pool']['token1']['id'],
-                    amount0 = mint['amount0'],
-                    amount1 = mint['amount1'],
-                    amount_usd = mint['amountUSD'],
-                    owner = mint['owner'],
-                    origin = mint['origin'],
-                    fee_tier = mint['pool']['feeTier'],
-                    liquidity = mint['pool']['liquidity'],
-                    dex_id = self.dex_id
+                pool = mint['pool']
+                token0_symbol, token0_name, token0_id = _token_fields(pool['token0'])
+                token1_symbol, token1_name, token1_id = _token_fields(pool['token1'])
+                fee_tier, liquidity = _pool_fields(pool)
+                amount0 = to_decimal(mint['amount0'])
+                amount1 = to_decimal(mint['amount1'])
+                # Skip events without any amounts
+                if amount0 is None and amount1 is None:
+                    continue
+                token_rows.append((token0_id, token0_symbol, token0_name))
+                token_rows.append((token1_id, token1_symbol, token1_name))
+                mint_row = (
+                    mint['id'],
+                    transaction_id,
+                    block_number,
+                    gas_used,
+                    gas_price,
+                    timestamp,
+                    dex_id,
+                    token0_id,
+                    token1_id,
+                    amount0,
+                    amount1,
+                    to_decimal(mint['amountUSD']),
+                    mint['owner'],
+                    mint['origin'],
+                    int(fee_tier) if fee_tier is not None else None,
+                    to_decimal(liquidity)
                 )
-                mint_transactions.append(mint_transaction)
-                #self.logger.debug(f"Processed mint event {mint['id']} for transaction {transaction.id}")
+                mint_rows.append(mint_row)
                 
-            self.logger.debug(f"Processed {len(mint_transactions)} mint events for transaction {transaction.id}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Processed %d mint events for transaction %s", len(mint_rows), transaction.id)
         except Exception as e:
             self.logger.error(f"Error processing mint events for transaction {transaction.id}: {str(e)}", exc_info=True)
             raise e
         
-        return mint_transactions
+        return mint_rows, token_rows
 
-    def _process_burns(self, burns_data: List[Dict], transaction: BaseTransaction) -> List[BurnEvent]:
-        
-        # Check if there are any burn transactions, check for none
-        if not len(burns_data) > 0:
-            #self.logger.debug(f"No burn events found for transaction {transaction.id}")
-            return []
-        
+    def _process_burns(self, burns_data: List[Dict], transaction: BaseTransaction) -> Tuple[List[tuple], List[tuple]]:
         try:
-            burn_transactions = []
+            burn_rows = []
+            token_rows = []
+            timestamp = transaction.timestamp
+            dex_id = self.dex_id
+            transaction_id, block_number = transaction.id, transaction.block_number
+            gas_used, gas_price = transaction.gas_used, transaction.gas_price
             for burn in burns_data:
-                burn_transaction = BurnEvent(
-                    parent_transaction = transaction,
-                    timestamp = transaction.timestamp,
-                    id = burn['id'],
-                    token0_symbol = burn['pool']['token0']['symbol'],
-                    token1_symbol = burn['pool']['token1']['symbol'],
-                    token0_id = burn['pool']['token0']['id'],
-                    token1_id = burn['pool']['token1']['id'],
-                    token0_name = burn['pool']['token0']['name'],
-                    token1_name = burn['pool']['token1']['name'],
-                    amount0 = burn['amount0'],
-                    amount1 = burn['amount1'],
-                    amount_usd = burn['amountUSD'],
-                    owner = burn['owner'],
-                    origin = burn['origin'],
-                    fee_tier = burn['pool']['feeTier'],
-                    liquidity = burn['pool']['liquidity'],
-                    dex_id = self.dex_id
+                pool = burn['pool']
+                token0_symbol, token0_name, token0_id = _token_fields(pool['token0'])
+                token1_symbol, token1_name, token1_id = _token_fields(pool['token1'])
+                fee_tier, liquidity = _pool_fields(pool)
+                amount0 = to_decimal(burn['amount0'])
+                amount1 = to_decimal(burn['amount1'])
+                # Skip events without any amounts
+                if amount0 is None and amount1 is None:
+                    continue
+                token_rows.append((token0_id, token0_symbol, token0_name))
+                token_rows.append((token1_id, token1_symbol, token1_name))
+                burn_row = (
+                    burn['id'],
+                    transaction_id,
+                    block_number,
+                    gas_used,
+                    gas_price,
+                    timestamp,
+                    dex_id,
+                    token0_id,
+                    token1_id,
+                    amount0,
+                    amount1,
+                    to_decimal(burn['amountUSD']),
+                    burn['owner'],
+                    burn['origin'],
+                    int(fee_tier) if fee_tier is not None else None,
+                    to_decimal(liquidity)
                 )
-                burn_transactions.append(burn_transaction)
-                #self.logger.debug(f"Processed burn event {burn['id']} for transaction {transaction.id}")
+                burn_rows.append(burn_row)
                 
-            self.logger.debug(f"Processed {len(burn_transactions)} burn events for transaction {transaction.id}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Processed %d burn events for transaction %s", len(burn_rows), transaction.id)
         except Exception as e:
             self.logger.error(f"Error processing burn events for transaction {transaction.id}: {str(e)}", exc_info=True)
             raise e
         
-        return burn_transactions
+        return burn_rows, token_rows
     
     def _process_collects(self, collects_data: List[Dict], transaction: BaseTransaction) -> List[CollectEvent]:
-        
-        # Check if there are any collect transactions, check for none
-        if not len(collects_data) > 0:
-            #self.logger.debug(f"No collect events found for transaction {transaction.id}")
-            return []
-        
         try:
             collect_transactions = []
             for collect in collects_data:
@@ -196,9 +218,9 @@ class UniswapV3Processor(BaseProcessor):
                     **collect
                 )
                 collect_transactions.append(collect_transaction)
-                #self.logger.debug(f"Processed collect event {collect['id']} for transaction {transaction.id}")
                 
-            self.logger.debug(f"Processed {len(collect_transactions)} collect events for transaction {transaction.id}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Processed %d collect events for transaction %s", len(collect_transactions), transaction.id)
         except Exception as e:
             self.logger.error(f"Error processing collect events for transaction {transaction.id}: {str(e)}", exc_info=True)
             raise e
@@ -207,12 +229,6 @@ class UniswapV3Processor(BaseProcessor):
     
     
     def _process_flashs(self, flashs_data: List[Dict], transaction: BaseTransaction) -> List[FlashEvent]:
-        
-        # Check if there are any flash transactions, check for none
-        if not len(flashs_data) > 0:
-            #self.logger.debug(f"No flash events found for transaction {transaction.id}")
-            return []
-        
         try:
             flash_transactions = []
             for flash in flashs_data:
@@ -221,9 +237,9 @@ class UniswapV3Processor(BaseProcessor):
                     **flash
                 )
                 flash_transactions.append(flash_transaction)
-                #self.logger.debug(f"Processed flash event {flash['id']} for transaction {transaction.id}")
                 
-            self.logger.debug(f"Processed {len(flash_transactions)} flash events for transaction {transaction.id}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Processed %d flash events for transaction %s", len(flash_transactions), transaction.id)
         except Exception as e:
             self.logger.error(f"Error processing flash events for transaction {transaction.id}: {str(e)}", exc_info=True)
             raise e
@@ -240,7 +256,7 @@ class UniswapV3Processor(BaseProcessor):
                 )
                 for token in tokens_data.get("data", {}).get("tokens", [])
             ]  
-            self.logger.debug(f"Processed {len(tokens)} tokens")
+            self.logger.debug("Processed %d tokens", len(tokens))
         except Exception as e:
             self.logger.error(f"Error processing tokens: {str(e)}", exc_info=True)
             raise e
@@ -3,20 +3,24 @@ from query.base_querier import BaseQuerier
 import logging
 from typing import Dict, Any
 
+# Query strings are static, build them once
+_TRANSACTIONS_QUERY = get_aerodrome_query()
+_TOKENS_QUERY = get_aerodrome_tokens_query()
+
 class AerodromeQuerier(BaseQuerier):
-    def __init__(self, url: str):
-        super().__init__(url)
+    def __init__(self, url: str, max_concurrent_queries: int = 8):
+        super().__init__(url, max_concurrent_queries)
         self.logger = logging.getLogger(__name__)
         self.logger.debug("Initialized AerodromeQuerier...")
 
-    def get_transactions(self, start_timestamp: int, end_timestamp: int, skip: int = 0) -> Dict[str, Any]:
+    async def get_transactions(self, start_timestamp: int, end_timestamp: int, skip: int = 0) -> Dict[str, Any]:
         variables = {
             "startTimestamp": start_timestamp,
             "endTimestamp": end_timestamp,
             "skip": skip
         }
         try:
-            response = self._send_query(get_aerodrome_query(), variables)
+            response = await self._send_query(_TRANSACTIONS_QUERY, variables)
             self.logger.debug(
                 f"Retrieved {len(response.get('data', {}).get('transactions', []))} "
                 f"transactions between {start_timestamp} and {end_timestamp}"
@@ -26,10 +30,10 @@ class AerodromeQuerier(BaseQuerier):
             self.logger.error(f"Error getting transactions: {str(e)}", exc_info=True)
             raise
     
-    def get_tokens(self, skip: int = 0) -> Dict[str, Any]:
+    async def get_tokens(self, skip: int = 0) -> Dict[str, Any]:
         variables = {
             "first": 1000,
             "skip": skip
         }
-        return self._send_query(get_aerodrome_tokens_query(), variables)
+        return await self._send_query(_TOKENS_QUERY, variables)
 
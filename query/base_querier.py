@@ -1,33 +1,55 @@
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-import requests
-from typing import Dict, Any
+import aiohttp
+import orjson
+from typing import Dict, Any, Optional
 
 class BaseQuerier(ABC):
-    def __init__(self, url: str):
+    def __init__(self, url: str, max_concurrent_queries: int = 8):
         self.url = url
+        # Upper bound on requests in flight against the subgraph
+        self.max_concurrent_queries = max_concurrent_queries
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-        self.logger.debug(f"Initialized {self.__class__.__name__}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Initialized %s", self.__class__.__name__)
 
     @abstractmethod
-    def get_transactions(self, start_timestamp: int, end_timestamp: int, skip: int = 0) -> Dict[str, Any]:
+    async def get_transactions(self, start_timestamp: int, end_timestamp: int, skip: int = 0) -> Dict[str, Any]:
         """Abstract method to get transactions within a time period"""
         pass
-    
+
     @abstractmethod
-    def get_tokens(self) -> Dict[str, Any]:
+    async def get_tokens(self) -> Dict[str, Any]:
         """Abstract method to get tokens from the specified DEX subgraph"""
         pass
-    
-    def _send_query(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the querier's session, created lazily since it must belong to the running event loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_queries)
+        return self._session
+
+    async def close(self):
+        """Close the querier's HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _send_query(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
         """Send GraphQL query and return response"""
+        session = self._get_session()
         try:
-            response = requests.post(
-                self.url,
-                json={"query": query, "variables": variables}
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            async with self._semaphore:
+                async with session.post(
+                    self.url,
+                    json={"query": query, "variables": variables}
+                ) as response:
+                    response.raise_for_status()
+                    # orjson parses the raw bytes straight into dicts, far quicker than json for large pages
+                    return orjson.loads(await response.read())
+        except aiohttp.ClientError as e:
             self.logger.error(f"Error sending GraphQL query: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
@@ -3,13 +3,17 @@ from typing import Dict, Any
 from .base_querier import BaseQuerier
 from .queries import get_uniswap_v2_query, get_uniswap_v2_tokens_query
 
+# Query strings are static, build them once
+_TRANSACTIONS_QUERY = get_uniswap_v2_query()
+_TOKENS_QUERY = get_uniswap_v2_tokens_query()
+
 class UniswapV2Querier(BaseQuerier):
-    def __init__(self, url: str):
-        super().__init__(url)
+    def __init__(self, url: str, max_concurrent_queries: int = 8):
+        super().__init__(url, max_concurrent_queries)
         self.logger = logging.getLogger(__name__)
         self.logger.debug("Initialized UniswapV2Querier...")
 
-    def get_transactions(self, start_timestamp: int, end_timestamp: int, skip: int = 0) -> Dict[str, Any]:
+    async def get_transactions(self, start_timestamp: int, end_timestamp: int, skip: int = 0) -> Dict[str, Any]:
 
         variables = {
             "startTimestamp": start_timestamp,
@@ -17,7 +21,7 @@ class UniswapV2Querier(BaseQuerier):
             "skip": skip
         }
         try:
-            response = self._send_query(get_uniswap_v2_query(), variables)
+            response = await self._send_query(_TRANSACTIONS_QUERY, variables)
             self.logger.debug(
                 f"Retrieved {len(response.get('data', {}).get('transactions', []))} "
                 f"transactions between {start_timestamp} and {end_timestamp}"
@@ -27,7 +31,7 @@ class UniswapV2Querier(BaseQuerier):
             self.logger.error(f"Error getting transactions: {str(e)}", exc_info=True)
             raise
     
-    def get_tokens(self, skip: int = 0) -> Dict[str, Any]:
+    async def get_tokens(self, skip: int = 0) -> Dict[str, Any]:
         """
         Get tokens from the specified DEX subgraph
         """
@@ -36,8 +40,9 @@ class UniswapV2Querier(BaseQuerier):
             "skip": skip
         }
         try:
-            response = self._send_query(get_uniswap_v2_tokens_query(), variables)
-            self.logger.debug(f"Retrieved {len(response.get('data', {}).get('tokens', []))} tokens")
+            response = await self._send_query(_TOKENS_QUERY, variables)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Retrieved %d tokens", len(response.get('data', {}).get('tokens', [])))
             return response
         except Exception as e:
             self.logger.error(f"Error getting tokens: {str(e)}", exc_info=True)
@@ -22,7 +22,7 @@ async def run_pipeline(pipeline, start_time, end_time):
     """
     try:
         logger.info(f"Starting pipeline for {pipeline.dexId} from {start_time} to {end_time}")
-        stats = await asyncio.to_thread(pipeline.process_time_range, start_time, end_time)
+        stats = await pipeline.process_time_range(start_time, end_time)
         logger.info(
             f"Pipeline completed: {stats['transactions_processed']} transactions, "
             f"{stats['events_processed']} events."
@@ -71,17 +71,29 @@ async def query_tokens(pipelines):
     for pipeline in pipelines.values():
         try:
             logger.info(f"Starting token query for {pipeline.dexId}")
-            await asyncio.to_thread(pipeline.process_tokens)
+            await pipeline.process_tokens()
             logger.info(f"Completed token query for {pipeline.dexId}")
         except Exception as e:
             logger.error(f"Error querying tokens for {pipeline.dexId}: {e}", exc_info=True)
     
 
+async def maintain_partitions(db):
+    """
+    Run pg_partman maintenance at regular intervals
+    """
+    while True:
+        try:
+            await asyncio.to_thread(db.run_partition_maintenance)
+        except Exception as e:
+            logger.error(f"Error maintaining partitions: {e}", exc_info=True)
+        await asyncio.sleep(Settings.PARTITION_MAINTENANCE_INTERVAL)
 
 async def main():
+    db = None
+    pipelines = {}
     try:
         # Initialize database
-        db = Database(Settings.POSTGRES_CONFIG)
+        db = Database(Settings.POSTGRES_CONFIG, Settings.PARTITION_MANAGER, Settings.PARTITION_RETENTION)
         
         # Load pipelines using the factory
         pipelines = PipelineFactory.load_pipelines(db, Settings.DEXES)
@@ -91,12 +103,16 @@ async def main():
 
         logger.info(f"Loaded pipelines for DEXes: {', '.join(pipelines.keys())}")
 
-        # Run initial query for the previous day
-        await asyncio.gather(
+        tasks = [
             initial_query(pipelines),
             query_loop(pipelines),
             query_tokens(pipelines),
-        )
+        ]
+        if Settings.PARTITION_MANAGER == 'pg_partman':
+            tasks.append(maintain_partitions(db))
+
+        # Run initial query for the previous day
+        await asyncio.gather(*tasks)
         
     except KeyboardInterrupt:
         logger.warning("Received KeyboardInterrupt. Shutting down...") 
@@ -105,6 +121,11 @@ async def main():
         logger.error(f"Pipeline failed: {str(e)}", exc_info=True)
         raise
 
+    finally:
+        await asyncio.gather(*(pipeline.querier.close() for pipeline in pipelines.values()))
+        if db is not None:
+            db.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())